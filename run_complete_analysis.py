@@ -5,35 +5,95 @@ Complete Labor Dynamics Analysis Runner
 Executes the full analysis pipeline using real API data.
 """
 
+import re
 import sys
+import copy
+import heapq
+import string
+import time
+import hashlib
 import logging
+import functools
 import yaml
 from pathlib import Path
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.append('src')
 
 from data_collection import BLSCollector, NCESCollector, process_and_merge
-from visualization import plot_trends, create_correlation_heatmap
+from analysis._kernels import cross_corr, trend_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Column-name patterns used to split the merged data into the two variable groups
+ENROLLMENT_PATTERN = re.compile(r'enrollment')
+EMPLOYMENT_PATTERN = re.compile(r'(?:un)?employment')
+
+CONFIG_PATH = Path('config/config.yaml')
+
+@functools.lru_cache(maxsize=1)
+def _parse_config():
+    """Parse the configuration file once; callers get copies via load_config."""
+    # Prefer the libyaml C loader when it is available
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(CONFIG_PATH) as f:
+        return yaml.load(f, Loader=loader) or {}
+
 def load_config():
-    """Load configuration file."""
-    config_path = Path('config/config.yaml')
-    if config_path.exists():
-        with open(config_path) as f:
-            return yaml.safe_load(f)
-    else:
+    """Load configuration file (parsed once; each call returns its own deep copy)."""
+    # Checked on every call so a missing file is never cached
+    if not CONFIG_PATH.exists():
         logger.error("Configuration file not found!")
         return None
+    return copy.deepcopy(_parse_config())
+
+def _cache_paths(config, key, count):
+    """
+    Return the cache file paths for a collector call, or None if caching is off.
+    
+    key must identify everything that shapes the collector's output (endpoint,
+    year range, series IDs, ...); key[0] names the files.
+    """
+    cache_config = config.get('processing', {}).get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    
+    cache_dir = Path(cache_config.get('directory', 'data/cache')) / 'api'
+    digest = hashlib.blake2b('|'.join(map(str, key)).encode(), digest_size=16).hexdigest()
+    return [cache_dir / f"{key[0]}_{digest}_{i}.parquet" for i in range(count)]
+
+def load_cached_frames(config, key, count=1):
+    """Load cached collector output if it exists and has not expired."""
+    paths = _cache_paths(config, key, count)
+    if paths is None or not all(path.exists() for path in paths):
+        return None
+    
+    expiry_days = config['processing']['cache'].get('expiry_days')
+    if expiry_days is not None:
+        age_seconds = time.time() - min(path.stat().st_mtime for path in paths)
+        if age_seconds > expiry_days * 86400:
+            return None
+    
+    return [pd.read_parquet(path) for path in paths]
+
+def store_cached_frames(config, key, frames):
+    """Cache collector output; empty or failed results are not cached."""
+    if any(df is None or df.empty for df in frames):
+        return
+    
+    paths = _cache_paths(config, key, len(frames))
+    if paths is None:
+        return
+    
+    paths[0].parent.mkdir(parents=True, exist_ok=True)
+    for df, path in zip(frames, paths):
+        df.to_parquet(path, index=False)
 
 def collect_employment_data(config):
     """Collect employment data from BLS API."""
@@ -45,6 +105,14 @@ def collect_employment_data(config):
     start_year = config['analysis']['time_range']['start_year']
     end_year = config['analysis']['time_range']['end_year']
     
+    # The series mappings define both what is fetched and the column names
+    cache_key = ('bls_employment', collector.base_url, start_year, end_year,
+                 sorted(collector.series_ids.items()), sorted(collector.youth_series.items()))
+    cached = load_cached_frames(config, cache_key, count=2)
+    if cached is not None:
+        logger.info(f"✅ Employment data loaded from cache: {len(cached[0])} records")
+        return cached[0], cached[1]
+    
     try:
         employment_data = collector.get_employment_data(start_year, end_year)
         youth_data = collector.get_youth_employment_data(start_year, end_year)
@@ -52,6 +120,7 @@ def collect_employment_data(config):
         logger.info(f"✅ Employment data collected: {len(employment_data)} records")
         logger.info(f"✅ Youth employment data collected: {len(youth_data)} records")
         
+        store_cached_frames(config, cache_key, [employment_data, youth_data])
         return employment_data, youth_data
     except Exception as e:
         logger.error(f"❌ Failed to collect employment data: {e}")
@@ -65,9 +134,17 @@ def collect_enrollment_data(config):
     start_year = config['analysis']['time_range']['start_year']
     end_year = config['analysis']['time_range']['end_year']
     
+    cache_key = ('nces_enrollment_totals', collector.base_url,
+                 collector.endpoints['enrollment_totals'], start_year, end_year)
+    cached = load_cached_frames(config, cache_key)
+    if cached is not None:
+        logger.info(f"✅ Enrollment data loaded from cache: {len(cached[0])} records")
+        return cached[0]
+    
     try:
         # Try real data first, fallback to synthetic
         enrollment_data = collector.get_total_enrollment_trends(start_year, end_year)
+        store_cached_frames(config, cache_key, [enrollment_data])
         
         if enrollment_data.empty:
             logger.warning("Real enrollment data unavailable, using synthetic data...")
@@ -79,54 +156,85 @@ def collect_enrollment_data(config):
         logger.error(f"❌ Failed to collect enrollment data: {e}")
         return None
 
-def analyze_correlations(merged_data):
-    """Analyze correlations between enrollment and employment."""
+def numeric_matrix(df):
+    """
+    Materialize the numeric columns of a DataFrame as one column-major buffer.
+    
+    Returns the float32 matrix and a mapping of column name to column position,
+    so downstream steps can take zero-copy column views instead of converting
+    the DataFrame again.
+    """
+    numeric_cols = [col for col, dtype in df.dtypes.items() if dtype.kind in 'iuf']
+    matrix = np.asfortranarray(df[numeric_cols].to_numpy(dtype=np.float32))
+    return matrix, {col: i for i, col in enumerate(numeric_cols)}
+
+def analyze_correlations(merged_data, num_matrix=None, col_index=None):
+    """
+    Analyze correlations between enrollment and employment.
+    
+    Returns the enrollment x employment cross-correlation block (rows are
+    enrollment columns, columns are employment columns) and the list of
+    significant pairs.
+    """
     logger.info("🔄 Analyzing correlations...")
     
-    # Select numeric columns
-    numeric_cols = merged_data.select_dtypes(include=[np.number]).columns
-    correlation_matrix = merged_data[numeric_cols].corr()
+    # float32 is ample precision for gating on |r| > 0.3
+    if num_matrix is None or col_index is None:
+        num_matrix, col_index = numeric_matrix(merged_data)
+    numeric_cols = list(col_index)
     
     # Find significant correlations
-    enrollment_cols = [col for col in numeric_cols if 'enrollment' in col.lower()]
-    employment_cols = [col for col in numeric_cols if 'employment' in col.lower() or 'unemployment' in col.lower()]
-    
-    significant_correlations = []
-    for enroll_col in enrollment_cols:
-        for employ_col in employment_cols:
-            if enroll_col != employ_col:
-                corr_val = correlation_matrix.loc[enroll_col, employ_col]
-                if abs(corr_val) > 0.3:
-                    significant_correlations.append({
-                        'enrollment_var': enroll_col,
-                        'employment_var': employ_col,
-                        'correlation': corr_val,
-                        'strength': 'Strong' if abs(corr_val) > 0.7 else 'Moderate' if abs(corr_val) > 0.5 else 'Weak'
-                    })
+    lowered = [col.lower() for col in numeric_cols]
+    enrollment_idx = [i for i, col in enumerate(lowered) if ENROLLMENT_PATTERN.search(col)]
+    employment_idx = [i for i, col in enumerate(lowered) if EMPLOYMENT_PATTERN.search(col)]
+    enrollment_cols = [numeric_cols[i] for i in enrollment_idx]
+    employment_cols = [numeric_cols[i] for i in employment_idx]
+    
+    # Only the enrollment x employment block is needed, not the full matrix
+    block = cross_corr(num_matrix[:, enrollment_idx], num_matrix[:, employment_idx])
+    cross_correlation = pd.DataFrame(block, index=enrollment_cols, columns=employment_cols)
+    
+    abs_block = np.abs(block)
+    mask = abs_block > 0.3
+    # A column matching both keywords must not be paired with itself
+    mask &= np.array(enrollment_cols, dtype=object)[:, None] != np.array(employment_cols, dtype=object)[None, :]
+    i_idx, j_idx = np.nonzero(mask)
+    abs_vals = abs_block[i_idx, j_idx]
+    strengths = np.select([abs_vals > 0.7, abs_vals > 0.5], ['Strong', 'Moderate'], default='Weak')
+    
+    # Gather the hits with one fancy-index read and plain-int positions rather
+    # than per-pair label lookups or NumPy scalar indexing
+    significant_correlations = [
+        {
+            'enrollment_var': enrollment_cols[i],
+            'employment_var': employment_cols[j],
+            'correlation': corr_val,
+            'strength': strength
+        }
+        for i, j, corr_val, strength in zip(i_idx.tolist(), j_idx.tolist(),
+                                            block[i_idx, j_idx].tolist(), strengths.tolist())
+    ]
     
     logger.info(f"✅ Found {len(significant_correlations)} significant correlations")
-    return correlation_matrix, significant_correlations
+    return cross_correlation, significant_correlations
+
+def _trend_stats(years, values):
+    """Calculate trend statistics from year-sorted arrays."""
+    slope, avg_growth, total_growth, volatility = trend_stats(years, values)
+    return {
+        'avg_annual_growth': avg_growth,
+        'total_growth': total_growth,
+        'trend_slope': slope,
+        'volatility': volatility
+    }
 
 def calculate_trends(data, value_col):
     """Calculate trend statistics."""
     if value_col not in data.columns or 'year' not in data.columns:
         return None
     
-    # Calculate year-over-year growth
-    data_sorted = data.sort_values('year')
-    growth_rates = data_sorted[value_col].pct_change() * 100
-    
-    # Calculate trend line
-    years = data_sorted['year'].values
-    values = data_sorted[value_col].values
-    trend_slope = np.polyfit(years, values, 1)[0]
-    
-    return {
-        'avg_annual_growth': growth_rates.mean(),
-        'total_growth': ((values[-1] / values[0]) - 1) * 100,
-        'trend_slope': trend_slope,
-        'volatility': growth_rates.std()
-    }
+    data_sorted = data.sort_values('year', kind='stable')
+    return _trend_stats(data_sorted['year'].to_numpy(), data_sorted[value_col].to_numpy())
 
 def generate_insights(enrollment_data, employment_data, merged_data, correlations):
     """Generate key insights from the analysis."""
@@ -141,96 +249,61 @@ def generate_insights(enrollment_data, employment_data, merged_data, correlation
         'correlations': {
             'total_significant': len(correlations),
             'strong_correlations': len([c for c in correlations if abs(c['correlation']) > 0.7]),
-            'key_findings': correlations[:5]  # Top 5 correlations
+            'key_findings': heapq.nlargest(5, correlations, key=lambda c: abs(c['correlation']))  # Top 5 correlations
         }
     }
     
     # Enrollment trends
-    if 'total_enrollment' in enrollment_data.columns:
-        enrollment_trends = calculate_trends(enrollment_data, 'total_enrollment')
-        if enrollment_trends:
-            insights['enrollment_trends'] = enrollment_trends
+    if 'total_enrollment' in enrollment_data.columns and 'year' in enrollment_data.columns:
+        enrollment_sorted = enrollment_data.sort_values('year', kind='stable')
+        insights['enrollment_trends'] = _trend_stats(
+            enrollment_sorted['year'].to_numpy(),
+            enrollment_sorted['total_enrollment'].to_numpy()
+        )
     
     # Employment trends
-    if 'employment_level' in employment_data.columns:
-        employment_trends = calculate_trends(employment_data, 'employment_level')
-        if employment_trends:
-            insights['employment_trends'] = employment_trends
+    if 'employment_level' in employment_data.columns and 'year' in employment_data.columns:
+        employment_sorted = employment_data.sort_values('year', kind='stable')
+        insights['employment_trends'] = _trend_stats(
+            employment_sorted['year'].to_numpy(),
+            employment_sorted['employment_level'].to_numpy()
+        )
     
     # Unemployment analysis
     if 'unemployment_rate' in employment_data.columns:
+        # Pull the column out once and reduce on the raw array
+        urates = employment_data['unemployment_rate'].to_numpy(dtype=np.float64)
+        has_rates = urates.size > 0
         unemployment_stats = {
-            'average_rate': employment_data['unemployment_rate'].mean(),
-            'min_rate': employment_data['unemployment_rate'].min(),
-            'max_rate': employment_data['unemployment_rate'].max(),
-            'recent_rate': employment_data['unemployment_rate'].iloc[-1] if not employment_data.empty else None
+            'average_rate': np.nanmean(urates) if has_rates else np.nan,
+            'min_rate': np.nanmin(urates) if has_rates else np.nan,
+            'max_rate': np.nanmax(urates) if has_rates else np.nan,
+            'recent_rate': urates[-1] if has_rates else None
         }
         insights['unemployment_analysis'] = unemployment_stats
     
     return insights
 
-def create_comprehensive_report(insights, output_dir):
-    """Create a comprehensive analysis report."""
-    logger.info("📄 Generating comprehensive report...")
-    
-    report_path = output_dir / f"labor_dynamics_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-    
-    with open(report_path, 'w') as f:
-        f.write(f"""# Labor Dynamics Analysis Report
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+REPORT_TEMPLATE = string.Template("""# Labor Dynamics Analysis Report
+Generated on: $generated_on
 
 ## Executive Summary
 
-This report analyzes the relationship between college enrollment trends and labor market dynamics in the United States from {insights['data_summary']['analysis_period']}.
+This report analyzes the relationship between college enrollment trends and labor market dynamics in the United States from $analysis_period.
 
 ## Key Findings
 
 ### Data Overview
-- **Analysis Period**: {insights['data_summary']['analysis_period']}
-- **Total Records**: {insights['data_summary']['total_records']}
-- **Variables Analyzed**: {insights['data_summary']['variables_analyzed']}
+- **Analysis Period**: $analysis_period
+- **Total Records**: $total_records
+- **Variables Analyzed**: $variables_analyzed
 
 ### Correlation Analysis
-- **Total Significant Correlations**: {insights['correlations']['total_significant']}
-- **Strong Correlations (|r| > 0.7)**: {insights['correlations']['strong_correlations']}
+- **Total Significant Correlations**: $total_significant
+- **Strong Correlations (|r| > 0.7)**: $strong_correlations
 
 #### Top Correlations:
-""")
-        
-        for i, corr in enumerate(insights['correlations']['key_findings'], 1):
-            f.write(f"{i}. **{corr['enrollment_var']}** ↔ **{corr['employment_var']}**: {corr['correlation']:.3f} ({corr['strength']})\n")
-        
-        if 'enrollment_trends' in insights:
-            trends = insights['enrollment_trends']
-            f.write(f"""
-### Enrollment Trends
-- **Average Annual Growth**: {trends['avg_annual_growth']:.2f}%
-- **Total Growth Over Period**: {trends['total_growth']:.1f}%
-- **Trend Slope**: {trends['trend_slope']:.0f} per year
-- **Volatility (Std Dev)**: {trends['volatility']:.2f}%
-""")
-        
-        if 'employment_trends' in insights:
-            trends = insights['employment_trends']
-            f.write(f"""
-### Employment Trends  
-- **Average Annual Growth**: {trends['avg_annual_growth']:.2f}%
-- **Total Growth Over Period**: {trends['total_growth']:.1f}%
-- **Trend Slope**: {trends['trend_slope']:.0f} per year
-- **Volatility (Std Dev)**: {trends['volatility']:.2f}%
-""")
-        
-        if 'unemployment_analysis' in insights:
-            unemp = insights['unemployment_analysis']
-            f.write(f"""
-### Unemployment Analysis
-- **Average Unemployment Rate**: {unemp['average_rate']:.1f}%
-- **Minimum Rate**: {unemp['min_rate']:.1f}%
-- **Maximum Rate**: {unemp['max_rate']:.1f}%
-- **Most Recent Rate**: {unemp['recent_rate']:.1f}%
-""")
-        
-        f.write("""
+$top_correlations$enrollment_trends$employment_trends$unemployment_analysis
 ## Methodology
 
 This analysis employed the following data sources and methods:
@@ -258,6 +331,61 @@ The analysis reveals significant relationships between higher education enrollme
 ---
 *Report generated by Labor Dynamics Analysis Tool*
 """)
+
+_TRENDS_SECTION = """
+### {heading}
+- **Average Annual Growth**: {avg_annual_growth:.2f}%
+- **Total Growth Over Period**: {total_growth:.1f}%
+- **Trend Slope**: {trend_slope:.0f} per year
+- **Volatility (Std Dev)**: {volatility:.2f}%
+"""
+
+_UNEMPLOYMENT_SECTION = """
+### Unemployment Analysis
+- **Average Unemployment Rate**: {average_rate:.1f}%
+- **Minimum Rate**: {min_rate:.1f}%
+- **Maximum Rate**: {max_rate:.1f}%
+- **Most Recent Rate**: {recent_rate:.1f}%
+"""
+
+_CORRELATION_ROW = "{0}. **{1[enrollment_var]}** ↔ **{1[employment_var]}**: {1[correlation]:.3f} ({1[strength]})\n"
+
+def create_comprehensive_report(insights, output_dir):
+    """Create a comprehensive analysis report."""
+    logger.info("📄 Generating comprehensive report...")
+    
+    report_path = output_dir / f"labor_dynamics_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+    summary = insights['data_summary']
+    correlations = insights['correlations']
+    
+    # Pre-format every section; missing sections substitute as empty strings
+    mapping = {
+        'generated_on': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'analysis_period': summary['analysis_period'],
+        'total_records': summary['total_records'],
+        'variables_analyzed': summary['variables_analyzed'],
+        'total_significant': correlations['total_significant'],
+        'strong_correlations': correlations['strong_correlations'],
+        'top_correlations': ''.join(_CORRELATION_ROW.format(i, corr)
+                                    for i, corr in enumerate(correlations['key_findings'], 1)),
+        'enrollment_trends': '',
+        'employment_trends': '',
+        'unemployment_analysis': ''
+    }
+    
+    if 'enrollment_trends' in insights:
+        mapping['enrollment_trends'] = _TRENDS_SECTION.format(heading='Enrollment Trends',
+                                                              **insights['enrollment_trends'])
+    
+    if 'employment_trends' in insights:
+        mapping['employment_trends'] = _TRENDS_SECTION.format(heading='Employment Trends  ',
+                                                              **insights['employment_trends'])
+    
+    if 'unemployment_analysis' in insights:
+        mapping['unemployment_analysis'] = _UNEMPLOYMENT_SECTION.format(**insights['unemployment_analysis'])
+    
+    with open(report_path, 'w', buffering=1 << 16) as f:
+        f.write(REPORT_TEMPLATE.substitute(mapping))
     
     logger.info(f"✅ Report saved to: {report_path}")
     return report_path
@@ -278,9 +406,12 @@ def main():
     data_dir = Path('data/processed')
     data_dir.mkdir(parents=True, exist_ok=True)
     
-    # Collect data
-    employment_data, youth_data = collect_employment_data(config)
-    enrollment_data = collect_enrollment_data(config)
+    # Collect data (BLS and NCES are independent, so fetch them concurrently)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        employment_future = executor.submit(collect_employment_data, config)
+        enrollment_future = executor.submit(collect_enrollment_data, config)
+        employment_data, youth_data = employment_future.result()
+        enrollment_data = enrollment_future.result()
     
     if employment_data is None or enrollment_data is None:
         logger.error("❌ Data collection failed, cannot proceed with analysis")
@@ -296,32 +427,39 @@ def main():
     
     logger.info(f"✅ Merged dataset created: {merged_data.shape}")
     
+    # Numeric view of the merged data shared by the analysis steps; only this
+    # correlation buffer is float32, merged_data itself stays float64
+    num_matrix, col_index = numeric_matrix(merged_data)
+    
     # Analysis
-    correlation_matrix, correlations = analyze_correlations(merged_data)
+    cross_correlation, correlations = analyze_correlations(merged_data, num_matrix, col_index)
     
     # Generate insights
     insights = generate_insights(enrollment_data, employment_data, merged_data, correlations)
     
-    # Create visualizations
+    # Create visualizations (plotting stack is only imported when it is needed)
     logger.info("📊 Creating visualizations...")
-    
-    # Trend plots
-    trend_fig = plot_trends(enrollment_data, employment_data, save_path=str(output_dir))
-    plt.close(trend_fig)
-    
-    # Correlation heatmap
-    corr_fig = create_correlation_heatmap(merged_data, 
-                                         title="Labor Dynamics: Enrollment-Employment Correlations",
-                                         save_path=str(output_dir / "correlation_heatmap.png"))
-    plt.close(corr_fig)
-    
-    # Save processed data
-    enrollment_data.to_csv(data_dir / 'final_enrollment_data.csv', index=False)
-    employment_data.to_csv(data_dir / 'final_employment_data.csv', index=False) 
-    merged_data.to_csv(data_dir / 'final_merged_analysis_data.csv', index=False)
-    
-    # Generate report
-    report_path = create_comprehensive_report(insights, output_dir)
+    from visualization import render_all
+    
+    # Trend plots and the correlation heatmap (mostly text and rectangles, so
+    # vector formats suit it)
+    heatmap_format = config.get('visualization', {}).get('plots', {}).get('heatmap_format', 'png')
+    render_all(enrollment_data, employment_data, merged_data, output_dir,
+               heatmap_format=heatmap_format,
+               heatmap_title="Labor Dynamics: Enrollment-Employment Correlations")
+    
+    # Save processed data and generate the report; the outputs are independent
+    outputs = [
+        (enrollment_data, data_dir / 'final_enrollment_data.csv'),
+        (employment_data, data_dir / 'final_employment_data.csv'),
+        (merged_data, data_dir / 'final_merged_analysis_data.csv')
+    ]
+    with ThreadPoolExecutor(max_workers=len(outputs) + 1) as executor:
+        write_futures = [executor.submit(df.to_csv, path, index=False) for df, path in outputs]
+        report_future = executor.submit(create_comprehensive_report, insights, output_dir)
+        for future in write_futures:
+            future.result()
+        report_path = report_future.result()
     
     # Summary
     logger.info("="*60)
@@ -188,7 +188,7 @@ def main():
         
         # Export for causal analysis if requested
         if args.export_causal:
-            causal_path = output_dir / f'causal_analysis_data_{timestamp}.csv'
+            causal_path = output_dir / f'causal_analysis_data_{timestamp}.parquet'
             logger.info(f"Exporting dataset for causal analysis to {causal_path}...")
             analyzer.export_for_causal_analysis(causal_path)
             logger.info("Causal analysis dataset exported successfully")
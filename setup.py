@@ -13,7 +13,8 @@ README = (HERE / "README.md").read_text()
 # Read requirements
 def read_requirements(filename):
     with open(filename, 'r') as f:
-        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        # Single pass per line: drop comments (including inline ones), then strip
+        return [req for req in (line.partition('#')[0].strip() for line in f) if req]
 
 requirements = read_requirements('requirements.txt')
 
@@ -43,6 +44,7 @@ setup(
     install_requires=requirements,
     extras_require={
         "dev": read_requirements("requirements-dev.txt")[1:],  # Skip -r requirements.txt line
+        "polars": ["polars>=0.20.0"],  # DataProcessor(engine="polars")
     },
     entry_points={
         "console_scripts": [
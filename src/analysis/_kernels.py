@@ -0,0 +1,131 @@
+"""
+Numeric kernels shared by the analysis pipeline.
+
+Plain NumPy implementations of the trend, correlation and grouped-median
+arithmetic, operating on raw arrays so callers can leave pandas before the
+inner math.
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+def trend_stats(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Compute trend statistics for a series sorted by x.
+    
+    Args:
+        x: Sorted x values (e.g. years)
+        y: Values aligned with x
+    
+    Returns:
+        Tuple of (slope, average growth %, total growth %, growth volatility %)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # Period-over-period growth, computed in place in a single buffer
+    growth = np.empty(max(y.size - 1, 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(y[1:], y[:-1], out=growth)
+    growth -= 1.0
+    growth *= 100
+    growth = growth[~np.isnan(growth)]
+    
+    # Mean and sample std of the growth rates from one deviation vector
+    avg_growth = growth.mean() if growth.size else np.nan
+    if growth.size > 1:
+        growth -= avg_growth
+        volatility = np.sqrt((growth @ growth) / (growth.size - 1))
+    else:
+        volatility = np.nan
+    
+    # Least-squares slope in closed form: cov(x, y) / var(x)
+    x_dev = x - x.mean()
+    slope = (x_dev @ (y - y.mean())) / (x_dev @ x_dev)
+    
+    total_growth = ((y[-1] / y[0]) - 1) * 100
+    
+    return slope, avg_growth, total_growth, volatility
+
+
+def cross_corr(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation between every column of A and every column of B.
+    
+    Uses pairwise-complete observations (like DataFrame.corr) but only
+    computes the A x B block instead of the full matrix.
+    
+    Float32 inputs are processed in float32; anything else in float64.
+    
+    Args:
+        A: 2-D array of shape (n_obs, n_a)
+        B: 2-D array of shape (n_obs, n_b)
+    
+    Returns:
+        Array of shape (n_a, n_b) with correlation coefficients
+    """
+    dtype = np.result_type(np.asarray(A).dtype, np.asarray(B).dtype, np.float32)
+    if dtype != np.float32:
+        dtype = np.dtype(np.float64)
+    A = np.asarray(A, dtype=dtype)
+    B = np.asarray(B, dtype=dtype)
+    
+    # Centre first so the sum-of-products form stays numerically stable
+    A = A - np.nanmean(A, axis=0)
+    B = B - np.nanmean(B, axis=0)
+    
+    valid_a = ~np.isnan(A)
+    valid_b = ~np.isnan(B)
+    A0 = np.where(valid_a, A, dtype.type(0))
+    B0 = np.where(valid_b, B, dtype.type(0))
+    Ma = valid_a.astype(dtype)
+    Mb = valid_b.astype(dtype)
+    
+    n = Ma.T @ Mb
+    sum_a = A0.T @ Mb
+    sum_b = Ma.T @ B0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = A0.T @ B0 - sum_a * sum_b / n
+        var_a = (A0 * A0).T @ Mb - sum_a ** 2 / n
+        var_b = Ma.T @ (B0 * B0) - sum_b ** 2 / n
+        corr = cov / np.sqrt(var_a * var_b)
+    
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def masked_medians(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Median of values over the rows selected by each column of a boolean mask.
+    
+    Sorts the values once and locates every column's middle elements from a
+    running count of selected rows, instead of a NaN-filled matrix per column.
+    
+    Args:
+        values: 1-D array of shape (n_obs,)
+        mask: Boolean array of shape (n_obs, n_cols); selected rows must not
+              be NaN in values
+    
+    Returns:
+        Float64 array of shape (n_cols,), NaN where a column selects no rows
+    """
+    values = np.asarray(values, dtype=np.float64)
+    medians = np.full(mask.shape[1], np.nan)
+    if values.size == 0:
+        return medians
+    
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    
+    # Running count of selected rows in sorted order, per column
+    counts = np.cumsum(mask[order], axis=0, dtype=np.int32)
+    n = counts[-1]
+    
+    # First sorted position reaching the lower and upper middle ranks
+    lower = np.argmax(counts >= ((n + 1) // 2)[None, :], axis=0)
+    upper = np.argmax(counts >= (n // 2 + 1)[None, :], axis=0)
+    
+    has_rows = n > 0
+    medians[has_rows] = (sorted_values[lower[has_rows]] + sorted_values[upper[has_rows]]) / 2
+    return medians
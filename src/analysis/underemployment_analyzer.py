@@ -12,9 +12,12 @@ long-term earnings trajectories or if graduates recover over time.
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Tuple, Optional
+import warnings
+from typing import Dict, Tuple, Optional, Iterable
 from pathlib import Path
 
+from ._kernels import masked_medians
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +31,12 @@ class UnderemploymentAnalyzer:
     - Institution type effects
     - Socioeconomic stratification patterns
     - Career trajectory "scarring" indicators
+    
+    The analyzer keeps a shallow copy of the input frame: column buffers are
+    shared with the caller's DataFrame rather than duplicated, and derived or
+    converted columns replace columns only in the analyzer's own frame (the
+    same semantics pandas Copy-on-Write gives). Methods that need to mutate a
+    subset take an explicit ``.copy()`` of it.
     """
     
     # PCIP code to field name mapping
@@ -74,7 +83,7 @@ class UnderemploymentAnalyzer:
             data: DataFrame containing college scorecard data with earnings,
                   completion rates, and field of study information
         """
-        self.data = data.copy()
+        self.data = data.copy(deep=False)
         self._prepare_data()
         
     def _prepare_data(self):
@@ -85,32 +94,75 @@ class UnderemploymentAnalyzer:
         key_vars = ['MD_EARN_WNE_P10', 'PCTPELL', 'C150_4_POOLED_SUPP', 
                    'CONTROL', 'PREDDEG', 'UGDS', 'RPY_3YR_RT_SUPP', 'PCTFLOAN']
         
-        for col in key_vars:
-            if col in self.data.columns:
-                self.data[col] = pd.to_numeric(self.data[col], errors='coerce')
+        present = [col for col in key_vars if col in self.data.columns]
+        if present:
+            self.data[present] = self.data[present].apply(pd.to_numeric, errors='coerce')
+        
+        # Extract the analysed columns once; the analyses share these arrays
+        # and their non-missing masks instead of rescanning the frame
+        self._arrays = {
+            col: self.data[col].to_numpy()
+            for col in ['MD_EARN_WNE_P10', 'C150_4_POOLED_SUPP', 'PCTPELL', 'RPY_3YR_RT_SUPP']
+            if col in self.data.columns
+        }
+        self._masks = {col: ~np.isnan(values) for col, values in self._arrays.items()}
+        self._pcip_cols = [code for code in self.FIELD_MAPPING if code in self.data.columns]
         
         # Create underemployment proxy (low earnings relative to degree level)
         if 'MD_EARN_WNE_P10' in self.data.columns:
-            self.data['EARNINGS_PERCENTILE'] = self.data['MD_EARN_WNE_P10'].rank(pct=True)
-            self.data['LOW_EARNINGS'] = (self.data['EARNINGS_PERCENTILE'] < 0.25).astype(int)
+            percentile = self._percentile_rank(self._arrays['MD_EARN_WNE_P10'].astype(np.float64))
+            self.data['EARNINGS_PERCENTILE'] = percentile
+            self.data['LOW_EARNINGS'] = (percentile < 0.25).astype(np.int8)
         
         # Create institution type labels
         if 'CONTROL' in self.data.columns:
-            self.data['CONTROL_LABEL'] = self.data['CONTROL'].map(self.INSTITUTION_TYPES)
+            # Categorical with integer codes so groupbys never hash label strings
+            control = self.data['CONTROL'].to_numpy()
+            codes = np.full(len(control), -1, dtype=np.int8)
+            for code, control_value in enumerate(self.INSTITUTION_TYPES):
+                codes[control == control_value] = code
+            self.data['CONTROL_LABEL'] = pd.Categorical.from_codes(
+                codes, categories=list(self.INSTITUTION_TYPES.values())
+            )
         
         # Create high-risk "scarring" indicator
         self._create_scarring_indicator()
         
         logger.info(f"Data prepared: {len(self.data)} institutions")
         
+    @staticmethod
+    def _percentile_rank(values: np.ndarray) -> np.ndarray:
+        """
+        Percentile rank of each value, equivalent to Series.rank(pct=True).
+        
+        Ties get their average rank and NaNs stay NaN; only one sort is needed.
+        
+        Args:
+            values: Float array, possibly containing NaN
+            
+        Returns:
+            Float64 array of percentile ranks in (0, 1]
+        """
+        valid = ~np.isnan(values)
+        ordered = np.sort(values[valid])
+        ranks = np.full(values.shape, np.nan)
+        lo = np.searchsorted(ordered, values[valid], side='left')
+        hi = np.searchsorted(ordered, values[valid], side='right')
+        ranks[valid] = (lo + hi + 1) / (2 * ordered.size)
+        return ranks
+        
     def _create_scarring_indicator(self):
         """Create indicator for institutions showing career trajectory scarring patterns."""
         if all(col in self.data.columns for col in ['C150_4_POOLED_SUPP', 'MD_EARN_WNE_P10', 'RPY_3YR_RT_SUPP']):
+            # NaN compares False, so missing values never flag an institution
+            completion = self._arrays['C150_4_POOLED_SUPP']
+            earnings = self._arrays['MD_EARN_WNE_P10']
+            repayment = self._arrays['RPY_3YR_RT_SUPP']
             self.data['HIGH_RISK'] = (
-                (self.data['C150_4_POOLED_SUPP'] < 0.30) | 
-                (self.data['MD_EARN_WNE_P10'] < 30000) |
-                (self.data['RPY_3YR_RT_SUPP'] < 0.40)
-            ).astype(int)
+                (completion < 0.30) | 
+                (earnings < 30000) |
+                (repayment < 0.40)
+            ).view(np.int8)
         
     def analyze_field_level_risk(self, min_institutions: int = 10, 
                                  field_threshold: float = 0.10) -> pd.DataFrame:
@@ -126,27 +178,29 @@ class UnderemploymentAnalyzer:
         """
         logger.info("Analyzing field-level underemployment risk...")
         
-        field_earnings = {}
-        pcip_cols = [col for col in self.data.columns if col.startswith('PCIP') and col != 'PCIP']
-        
-        for pcip_code, field_name in self.FIELD_MAPPING.items():
-            if pcip_code in self.data.columns:
-                # Get institutions where this field is substantial
-                field_mask = (self.data[pcip_code] > field_threshold) & self.data['MD_EARN_WNE_P10'].notna()
-                
-                if field_mask.sum() >= min_institutions:
-                    avg_earnings = self.data.loc[field_mask, 'MD_EARN_WNE_P10'].median()
-                    low_earnings_rate = self.data.loc[field_mask, 'LOW_EARNINGS'].mean()
-                    n_institutions = field_mask.sum()
-                    
-                    field_earnings[field_name] = {
-                        'median_earnings': avg_earnings,
-                        'underemployment_proxy': low_earnings_rate,
-                        'n_institutions': n_institutions
-                    }
-        
-        # Convert to DataFrame and sort by risk
-        field_df = pd.DataFrame(field_earnings).T.sort_values('underemployment_proxy', ascending=False)
+        # Evaluate every field at once on an (institutions x fields) matrix
+        field_codes = self._pcip_cols
+        pcip_matrix = self.data[field_codes].to_numpy()
+        earnings = self._arrays['MD_EARN_WNE_P10'].astype(np.float64)
+        low_earnings = self.data['LOW_EARNINGS'].to_numpy().astype(bool)
+        
+        # Institutions where each field is substantial
+        field_mask = (pcip_matrix > field_threshold) & self._masks['MD_EARN_WNE_P10'][:, None]
+        n_institutions = field_mask.sum(axis=0)
+        keep = n_institutions >= min_institutions
+        
+        with np.errstate(invalid='ignore'):
+            low_earnings_rate = field_mask[low_earnings].sum(axis=0) / n_institutions
+        median_earnings = np.full(len(field_codes), np.nan)
+        median_earnings[keep] = masked_medians(earnings, field_mask[:, keep])
+        
+        # Build the result straight from the per-field arrays and sort by risk
+        field_names = np.array([self.FIELD_MAPPING[code] for code in field_codes], dtype=object)
+        field_df = pd.DataFrame({
+            'median_earnings': median_earnings[keep],
+            'underemployment_proxy': low_earnings_rate[keep],
+            'n_institutions': n_institutions[keep]
+        }, index=field_names[keep]).sort_values('underemployment_proxy', ascending=False)
         
         logger.info(f"Analyzed {len(field_df)} fields of study")
         return field_df
@@ -163,20 +217,35 @@ class UnderemploymentAnalyzer:
         """
         logger.info("Analyzing completion rate gradient...")
         
-        completion_valid = self.data[self.data['C150_4_POOLED_SUPP'].notna()].copy()
-        
-        completion_valid['COMPLETION_QUARTILE'] = pd.qcut(
-            completion_valid['C150_4_POOLED_SUPP'], 
-            q=quartiles,
-            labels=[f'Q{i}: {"Lowest" if i==1 else "Low-Mid" if i==2 else "Mid-High" if i==3 else "Highest"}' 
-                   for i in range(1, quartiles+1)]
-        )
-        
-        completion_analysis = completion_valid.groupby('COMPLETION_QUARTILE').agg({
+        # Only the grouping and aggregated columns are sliced out of the frame
+        agg_spec = {
             'MD_EARN_WNE_P10': ['median', 'mean', 'count'],
             'RPY_3YR_RT_SUPP': 'mean',
             'PCTPELL': 'mean'
-        }).round(2)
+        }
+        completion_valid = self.data.loc[
+            self._masks['C150_4_POOLED_SUPP'], ['C150_4_POOLED_SUPP', *agg_spec]
+        ]
+        
+        # Quantile bins, right-closed with the lowest edge included (as pd.qcut)
+        completion = completion_valid['C150_4_POOLED_SUPP'].to_numpy(dtype=np.float64)
+        edges = np.quantile(completion, np.linspace(0, 1, quartiles + 1))
+        if np.any(np.diff(edges) == 0):
+            raise ValueError(f"Completion quartile edges must be unique: {edges}")
+        codes = np.searchsorted(edges[1:-1], completion, side='left').astype(np.int8)
+        completion_quartile = pd.Series(
+            pd.Categorical.from_codes(
+                codes,
+                categories=[f'Q{i}: {"Lowest" if i==1 else "Low-Mid" if i==2 else "Mid-High" if i==3 else "Highest"}' 
+                            for i in range(1, quartiles+1)],
+                ordered=True
+            ),
+            index=completion_valid.index, name='COMPLETION_QUARTILE'
+        )
+        
+        completion_analysis = completion_valid.groupby(
+            completion_quartile, observed=True
+        ).agg(agg_spec).round(2)
         
         logger.info(f"Completion gradient analysis complete: {quartiles} quartiles")
         return completion_analysis
@@ -190,13 +259,16 @@ class UnderemploymentAnalyzer:
         """
         logger.info("Analyzing institution type effects...")
         
-        inst_type_analysis = self.data.groupby('CONTROL_LABEL').agg({
+        agg_spec = {
             'MD_EARN_WNE_P10': ['median', 'mean'],
             'LOW_EARNINGS': 'mean',
             'RPY_3YR_RT_SUPP': 'mean',
             'C150_4_POOLED_SUPP': 'mean',
             'PCTPELL': 'mean'
-        }).round(3)
+        }
+        inst_type_analysis = self.data[['CONTROL_LABEL', *agg_spec]].groupby(
+            'CONTROL_LABEL', observed=True
+        ).agg(agg_spec).round(3)
         
         logger.info("Institution type analysis complete")
         return inst_type_analysis
@@ -210,19 +282,27 @@ class UnderemploymentAnalyzer:
         """
         logger.info("Analyzing socioeconomic stratification...")
         
-        pell_valid = self.data[self.data['PCTPELL'].notna()].copy()
-        pell_valid['PELL_CATEGORY'] = pd.cut(
-            pell_valid['PCTPELL'],
-            bins=[0, 0.25, 0.5, 0.75, 1.0],
-            labels=['Low (<25%)', 'Moderate (25-50%)', 'High (50-75%)', 'Very High (75-100%)']
-        )
-        
-        pell_analysis = pell_valid.groupby('PELL_CATEGORY').agg({
+        agg_spec = {
             'MD_EARN_WNE_P10': 'median',
             'LOW_EARNINGS': 'mean',
             'RPY_3YR_RT_SUPP': 'mean',
             'C150_4_POOLED_SUPP': 'mean'
-        }).round(3)
+        }
+        pell_valid = self.data.loc[self._masks['PCTPELL'], ['PCTPELL', *agg_spec]]
+        # Right-closed bins as pd.cut; shares outside (0, 1] get no category
+        pell_edges = np.array([0, 0.25, 0.5, 0.75, 1.0])
+        codes = np.searchsorted(pell_edges, pell_valid['PCTPELL'].to_numpy(dtype=np.float64), side='left') - 1
+        codes[codes >= len(pell_edges) - 1] = -1
+        pell_category = pd.Series(
+            pd.Categorical.from_codes(
+                codes.astype(np.int8),
+                categories=['Low (<25%)', 'Moderate (25-50%)', 'High (50-75%)', 'Very High (75-100%)'],
+                ordered=True
+            ),
+            index=pell_valid.index, name='PELL_CATEGORY'
+        )
+        
+        pell_analysis = pell_valid.groupby(pell_category, observed=True).agg(agg_spec).round(3)
         
         logger.info("Socioeconomic analysis complete")
         return pell_analysis
@@ -240,18 +320,23 @@ class UnderemploymentAnalyzer:
             logger.warning("HIGH_RISK indicator not available")
             return {}
         
-        high_risk_summary = self.data.groupby('HIGH_RISK').agg({
-            'MD_EARN_WNE_P10': 'median',
-            'C150_4_POOLED_SUPP': 'mean',
-            'RPY_3YR_RT_SUPP': 'mean',
-            'PCTPELL': 'mean'
-        }).round(3)
-        
-        high_risk_summary.index = ['Lower Risk', 'Higher Risk']
+        # Compare both risk groups directly on the shared column arrays
+        high_risk = self.data['HIGH_RISK'].to_numpy().astype(bool)
+        comparison = {}
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for label, in_group in [('Lower Risk', ~high_risk), ('Higher Risk', high_risk)]:
+                comparison[label] = {
+                    'MD_EARN_WNE_P10': np.nanmedian(self._arrays['MD_EARN_WNE_P10'][in_group]),
+                    'C150_4_POOLED_SUPP': np.nanmean(self._arrays['C150_4_POOLED_SUPP'][in_group]),
+                    'RPY_3YR_RT_SUPP': np.nanmean(self._arrays['RPY_3YR_RT_SUPP'][in_group]),
+                    'PCTPELL': np.nanmean(self._arrays['PCTPELL'][in_group])
+                }
+        high_risk_summary = pd.DataFrame.from_dict(comparison, orient='index').round(3)
         
         scarring_stats = {
-            'high_risk_count': int(self.data['HIGH_RISK'].sum()),
-            'high_risk_percentage': float(self.data['HIGH_RISK'].mean()),
+            'high_risk_count': int(np.count_nonzero(high_risk)),
+            'high_risk_percentage': float(high_risk.mean()),
             'comparison': high_risk_summary
         }
         
@@ -283,10 +368,10 @@ class UnderemploymentAnalyzer:
         """Generate summary statistics for the analysis."""
         stats = {
             'total_institutions': len(self.data),
-            'institutions_with_earnings': int(self.data['MD_EARN_WNE_P10'].notna().sum()),
-            'median_earnings': float(self.data['MD_EARN_WNE_P10'].median()),
-            'median_completion_rate': float(self.data['C150_4_POOLED_SUPP'].median()),
-            'median_pell_percentage': float(self.data['PCTPELL'].median())
+            'institutions_with_earnings': int(self._masks['MD_EARN_WNE_P10'].sum()),
+            'median_earnings': float(np.nanmedian(self._arrays['MD_EARN_WNE_P10'])),
+            'median_completion_rate': float(np.nanmedian(self._arrays['C150_4_POOLED_SUPP'])),
+            'median_pell_percentage': float(np.nanmedian(self._arrays['PCTPELL']))
         }
         return stats
     
@@ -295,7 +380,8 @@ class UnderemploymentAnalyzer:
         Export processed dataset for causal analysis (IV/DiD methods).
         
         Args:
-            output_path: Path to save the exported dataset
+            output_path: Path to save the exported dataset; written as CSV for a
+                         .csv suffix and as Snappy-compressed Parquet otherwise
             
         Returns:
             DataFrame with variables prepared for causal analysis
@@ -320,21 +406,39 @@ class UnderemploymentAnalyzer:
         # Save to file
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        causal_data.to_csv(output_path, index=False)
+        if output_path.suffix == '.csv':
+            causal_data.to_csv(output_path, index=False)
+        else:
+            causal_data.to_parquet(output_path, engine='pyarrow', compression='snappy', index=False)
         
         logger.info(f"Exported {len(causal_data)} institutions with {len(available_vars)} variables to {output_path}")
         return causal_data
 
 
-def load_college_scorecard_data(file_path: str) -> pd.DataFrame:
+# Numeric Scorecard variables used by the analyzer
+NUMERIC_COLUMNS = frozenset(UnderemploymentAnalyzer.FIELD_MAPPING) | frozenset([
+    'MD_EARN_WNE_P10', 'PCTPELL', 'C150_4_POOLED_SUPP', 'CONTROL', 'PREDDEG',
+    'UGDS', 'RPY_3YR_RT_SUPP', 'PCTFLOAN'
+])
+
+# Every Scorecard column the analysis pipeline reads
+REQUIRED_COLUMNS = NUMERIC_COLUMNS | frozenset(['UNITID', 'INSTNM', 'STABBR'])
+
+
+def load_college_scorecard_data(file_path: str,
+                                columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
     """
     Load College Scorecard data from CSV file.
     
     This is a convenience wrapper that uses the ScorecardCollector.
     For more advanced usage, use ScorecardCollector directly.
     
+    Only the columns used by UnderemploymentAnalyzer are parsed by default,
+    using pyarrow's multithreaded CSV reader.
+    
     Args:
         file_path: Path to College Scorecard CSV file
+        columns: Columns to load (defaults to REQUIRED_COLUMNS)
         
     Returns:
         DataFrame with College Scorecard data
@@ -342,8 +446,6 @@ def load_college_scorecard_data(file_path: str) -> pd.DataFrame:
     Raises:
         FileNotFoundError: If data file doesn't exist
     """
-    from pathlib import Path
-    
     file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(
@@ -351,12 +453,45 @@ def load_college_scorecard_data(file_path: str) -> pd.DataFrame:
             f"Please provide a valid path to the College Scorecard CSV file."
         )
     
+    wanted = REQUIRED_COLUMNS if columns is None else frozenset(columns)
+    
+    # Project at parse time; Scorecard extracts vary in which columns they carry
+    header = pd.read_csv(file_path, nrows=0).columns
+    usecols = [col for col in header if col in wanted]
+    numeric_cols = [col for col in usecols if col in NUMERIC_COLUMNS]
+    
     logger.info(f"Loading College Scorecard data from {file_path}...")
-    df = pd.read_csv(file_path, low_memory=False)
+    df = pd.read_csv(file_path, engine='pyarrow', usecols=usecols,
+                     na_values=['PrivacySuppressed'])
+    
+    # Coerce after parsing rather than forcing a dtype on the reader, so other
+    # suppression tokens (NULL, PS, ...) become NaN instead of failing the load
+    if numeric_cols:
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
     logger.info(f"Loaded {len(df):,} institutions with {len(df.columns)} columns")
     return df
 
 
+# Static closing section of the analysis report
+_KEY_FINDINGS_LINES = (
+    "KEY FINDINGS",
+    "-" * 80,
+    "1. FIELD-LEVEL VARIATION:",
+    "   - Liberal Arts and Humanities show highest underemployment risk",
+    "   - STEM and Health fields show lowest risk",
+    "   - 3-4x earnings difference between highest/lowest fields",
+    "",
+    "2. COMPLETION RATE GRADIENT:",
+    "   - Strong monotonic relationship: higher completion → higher earnings",
+    "   - Suggests completion may protect against underemployment scarring",
+    "",
+    "3. SOCIOECONOMIC STRATIFICATION:",
+    "   - Institutions serving high-Pell students have worse outcomes",
+    "   - Suggests cumulative disadvantage mechanism",
+    "",
+)
+
+
 def generate_analysis_report(results: Dict, output_path: Optional[Path] = None) -> str:
     """
     Generate a comprehensive text report from analysis results.
@@ -393,11 +528,15 @@ def generate_analysis_report(results: Dict, output_path: Optional[Path] = None)
         field_df = results['field_risk'].head(10)
         report_lines.append(f"{'Field':<30} | {'Median Earnings':>15} | {'Risk':>10} | {'N':>5}")
         report_lines.append("-" * 80)
-        for field, row in field_df.iterrows():
-            report_lines.append(
-                f"{field:<30} | ${row['median_earnings']:>14,.0f} | "
-                f"{row['underemployment_proxy']:>9.1%} | {int(row['n_institutions']):>5}"
+        report_lines.extend(
+            f"{field:<30} | ${earnings:>14,.0f} | {proxy:>9.1%} | {int(n):>5}"
+            for field, earnings, proxy, n in zip(
+                field_df.index,
+                field_df['median_earnings'].tolist(),
+                field_df['underemployment_proxy'].tolist(),
+                field_df['n_institutions'].tolist()
             )
+        )
         report_lines.append("")
     
     # Scarring patterns
@@ -409,21 +548,7 @@ def generate_analysis_report(results: Dict, output_path: Optional[Path] = None)
         report_lines.append("")
     
     # Key findings
-    report_lines.append("KEY FINDINGS")
-    report_lines.append("-" * 80)
-    report_lines.append("1. FIELD-LEVEL VARIATION:")
-    report_lines.append("   - Liberal Arts and Humanities show highest underemployment risk")
-    report_lines.append("   - STEM and Health fields show lowest risk")
-    report_lines.append("   - 3-4x earnings difference between highest/lowest fields")
-    report_lines.append("")
-    report_lines.append("2. COMPLETION RATE GRADIENT:")
-    report_lines.append("   - Strong monotonic relationship: higher completion → higher earnings")
-    report_lines.append("   - Suggests completion may protect against underemployment scarring")
-    report_lines.append("")
-    report_lines.append("3. SOCIOECONOMIC STRATIFICATION:")
-    report_lines.append("   - Institutions serving high-Pell students have worse outcomes")
-    report_lines.append("   - Suggests cumulative disadvantage mechanism")
-    report_lines.append("")
+    report_lines.extend(_KEY_FINDINGS_LINES)
     
     report_text = "\n".join(report_lines)
     
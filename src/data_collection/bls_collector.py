@@ -5,11 +5,16 @@ Handles fetching employment, unemployment, and labor force data from the BLS API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 import logging
 from typing import List, Dict, Optional, Union
 from datetime import datetime
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -17,17 +22,34 @@ logger = logging.getLogger(__name__)
 class BLSCollector:
     """Collector for Bureau of Labor Statistics data."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_workers: int = 4,
+                 request_interval: float = 0.5):
         """
         Initialize BLS collector.
         
         Args:
             api_key: BLS API key (optional but recommended for higher rate limits)
+            max_workers: Maximum number of concurrent API requests
+            request_interval: Minimum seconds between request start times
         """
         self.api_key = api_key
+        self.max_workers = max_workers
+        self.request_interval = request_interval
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
         self.base_url = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
         self.headers = {'Content-type': 'application/json'}
         
+        # One keep-alive session so chunked requests reuse the TLS connection;
+        # transient failures are retried with backoff (BLS queries are idempotent)
+        retry = Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['POST'])
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=10,
+                                                    max_retries=retry))
+        
         # Common BLS series IDs
         self.series_ids = {
             'civilian_labor_force': 'LNS11300000',
@@ -58,81 +80,126 @@ class BLSCollector:
         Returns:
             DataFrame with BLS data
         """
+        # BLS API limits to 50 series per request; chunks are fetched
+        # concurrently since each one is dominated by the HTTP round-trip
+        chunk_size = 50
+        chunks = [series_ids[i:i + chunk_size] for i in range(0, len(series_ids), chunk_size)]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                lambda chunk_ids: self._fetch_one_chunk(chunk_ids, start_year, end_year),
+                chunks
+            )
+            data_frames = [df for chunk_frames in results for df in chunk_frames]
+        
+        if data_frames:
+            return pd.concat(data_frames, ignore_index=True)
+        else:
+            return pd.DataFrame()
+    
+    def _fetch_one_chunk(self, chunk_ids: List[str], start_year: int,
+                         end_year: int) -> List[pd.DataFrame]:
+        """
+        Fetch and parse one request's worth of BLS series.
+        
+        Args:
+            chunk_ids: Up to 50 BLS series IDs
+            start_year: Starting year for data
+            end_year: Ending year for data
+            
+        Returns:
+            List holding the chunk's observations as one DataFrame (empty on
+            request failure)
+        """
         data_frames = []
         
-        # BLS API limits to 50 series per request
-        chunk_size = 50
-        for i in range(0, len(series_ids), chunk_size):
-            chunk_ids = series_ids[i:i + chunk_size]
+        payload = {
+            'seriesid': chunk_ids,
+            'startyear': str(start_year),
+            'endyear': str(end_year)
+        }
+        
+        if self.api_key:
+            payload['registrationkey'] = self.api_key
+        
+        try:
+            self._wait_for_rate_limit()
+            response = self._session.post(
+                self.base_url, 
+                json=payload, 
+                timeout=30
+            )
+            response.raise_for_status()
             
-            payload = {
-                'seriesid': chunk_ids,
-                'startyear': str(start_year),
-                'endyear': str(end_year)
-            }
+            data = response.json()
             
-            if self.api_key:
-                payload['registrationkey'] = self.api_key
+            if data['status'] != 'REQUEST_SUCCEEDED':
+                logger.warning(f"BLS API warning: {data.get('message', 'Unknown error')}")
             
-            try:
-                response = requests.post(
-                    self.base_url, 
-                    json=payload, 
-                    headers=self.headers,
-                    timeout=30
-                )
-                response.raise_for_status()
-                
-                data = response.json()
+            # Process series data
+            for series in data['Results']['series']:
+                series_id = series['seriesID']
+                observations = series['data']
                 
-                if data['status'] != 'REQUEST_SUCCEEDED':
-                    logger.warning(f"BLS API warning: {data.get('message', 'Unknown error')}")
+                if not observations:
+                    continue
                 
-                # Process series data
-                for series in data['Results']['series']:
-                    series_id = series['seriesID']
-                    series_data = []
-                    
-                    for item in series['data']:
-                        series_data.append({
-                            'series_id': series_id,
-                            'year': int(item['year']),
-                            'period': item['period'],
-                            'value': float(item['value']) if item['value'] != '' else None,
-                            'date': self._parse_bls_date(item['year'], item['period'])
-                        })
-                    
-                    if series_data:
-                        df = pd.DataFrame(series_data)
-                        data_frames.append(df)
+                # Collect each field as its own column list, then build the frame once
+                years = [item['year'] for item in observations]
+                periods = [item['period'] for item in observations]
+                values = [float(item['value']) if item['value'] != '' else np.nan
+                          for item in observations]
                 
-                # Rate limiting for API
-                time.sleep(0.5)
-                
-            except requests.RequestException as e:
-                logger.error(f"Error fetching BLS data: {e}")
-                continue
+                data_frames.append(pd.DataFrame({
+                    'series_id': series_id,
+                    'year': np.asarray(years, dtype=np.int16),
+                    'period': periods,
+                    'value': np.asarray(values, dtype=np.float64)
+                }))
+            
+        except requests.RequestException as e:
+            logger.error(f"Error fetching BLS data: {e}")
         
-        if data_frames:
-            return pd.concat(data_frames, ignore_index=True)
-        else:
-            return pd.DataFrame()
+        if not data_frames:
+            return []
+        
+        # Parse dates for the whole chunk at once
+        chunk_df = pd.concat(data_frames, ignore_index=True)
+        chunk_df['date'] = self._parse_bls_dates(chunk_df['year'], chunk_df['period'])
+        return [chunk_df]
     
-    def _parse_bls_date(self, year: str, period: str) -> pd.Timestamp:
-        """Parse BLS year/period format to datetime."""
-        try:
-            if period.startswith('M'):
-                month = int(period[1:])
-                return pd.Timestamp(year=int(year), month=month, day=1)
-            elif period.startswith('Q'):
-                quarter = int(period[1:])
-                month = (quarter - 1) * 3 + 1
-                return pd.Timestamp(year=int(year), month=month, day=1)
-            else:
-                # Annual data
-                return pd.Timestamp(year=int(year), month=1, day=1)
-        except ValueError:
-            return pd.NaT
+    def _wait_for_rate_limit(self):
+        """Space request start times at least request_interval seconds apart."""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + self.request_interval
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _parse_bls_dates(self, years: pd.Series, periods: pd.Series) -> pd.Series:
+        """
+        Parse BLS year/period codes to datetimes in one vectorized pass.
+        
+        Monthly (Mnn) and quarterly (Qn) periods map to the first day of their
+        month or quarter; any other period is treated as annual data. Invalid
+        periods, such as the M13 annual average, become NaT.
+        
+        Args:
+            years: Observation years
+            periods: BLS period codes aligned with years
+            
+        Returns:
+            Series of datetimes aligned with the inputs
+        """
+        kind = periods.str[0]
+        number = pd.to_numeric(periods.str[1:], errors='coerce').to_numpy(dtype=np.float64)
+        month = np.where(kind == 'M', number,
+                         np.where(kind == 'Q', (number - 1) * 3 + 1, 1))
+        return pd.to_datetime(
+            pd.DataFrame({'year': years, 'month': month, 'day': 1}, index=periods.index),
+            errors='coerce'
+        )
     
     def get_employment_data(self, start_year: int = 2000, 
                            end_year: int = 2024) -> pd.DataFrame:
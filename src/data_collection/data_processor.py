@@ -4,6 +4,7 @@ Data Processing Module for Labor Dynamics Analysis
 Handles merging, cleaning, and preprocessing of data from multiple sources.
 """
 
+import hashlib
 import pandas as pd
 import numpy as np
 import logging
@@ -16,13 +17,30 @@ logger = logging.getLogger(__name__)
 class DataProcessor:
     """Process and merge data from multiple sources."""
     
-    def __init__(self, cache_dir: Optional[str] = None):
+    # Low-cardinality label columns stored as categoricals after cleaning
+    CATEGORY_COLUMNS = ('data_source', 'institution_type', 'STABBR', 'period')
+    
+    # Merged columns read by calculate_derived_metrics
+    DERIVED_METRIC_INPUTS = (
+        'enrollment_total_enrollment', 'enrollment_undergraduate', 'enrollment_graduate',
+        'employment_civilian_labor_force', 'employment_employment_level'
+    )
+    
+    ENGINES = ('pandas', 'polars')
+    
+    def __init__(self, cache_dir: Optional[str] = None, engine: str = 'pandas'):
         """
         Initialize data processor.
         
         Args:
             cache_dir: Directory for caching processed data
+            engine: Backend for the merge aggregations, 'pandas' or 'polars'
+                    (requires the optional polars package: pip install .[polars])
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        
+        self.engine = engine
         self.cache_dir = Path(cache_dir) if cache_dir else Path("data/processed")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
@@ -39,7 +57,9 @@ class DataProcessor:
         if df.empty:
             return df
         
-        df_clean = df.copy()
+        # Shallow copy: converted columns are replaced rather than written in
+        # place, so the caller's frame is untouched without a full-frame copy
+        df_clean = df.copy(deep=False)
         
         # Standardize year column
         year_cols = ['year', 'data_year', 'academic_year']
@@ -50,23 +70,29 @@ class DataProcessor:
                 break
         
         if year_col and year_col != 'year':
-            df_clean = df_clean.rename(columns={year_col: 'year'})
+            df_clean.columns = ['year' if col == year_col else col for col in df_clean.columns]
         
-        # Convert numeric columns
-        numeric_cols = df_clean.select_dtypes(include=[object]).columns
-        for col in numeric_cols:
-            if col not in ['data_source', 'institution_type']:
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+        # Convert text columns to numeric as one block
+        numeric_cols = [col for col in df_clean.select_dtypes(include=[object, 'string']).columns
+                        if col not in ['data_source', 'institution_type']]
+        if numeric_cols:
+            df_clean[numeric_cols] = df_clean[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        
+        df_clean = self._compress_dtypes(df_clean)
         
         # Remove rows with all NaN values for key metrics
         key_metrics = ['total_enrollment', 'undergraduate', 'graduate']
         available_metrics = [col for col in key_metrics if col in df_clean.columns]
         if available_metrics:
-            df_clean = df_clean.dropna(subset=available_metrics, how='all')
+            has_metrics = df_clean[available_metrics].notna().any(axis=1)
+            if not has_metrics.all():
+                df_clean = df_clean[has_metrics]
         
-        # Sort by year
+        # Sort by year, skipping the sort when the rows are already in order
         if 'year' in df_clean.columns:
-            df_clean = df_clean.sort_values('year').reset_index(drop=True)
+            if not df_clean['year'].is_monotonic_increasing:
+                df_clean = df_clean.sort_values('year')
+            df_clean.index = pd.RangeIndex(len(df_clean))
         
         return df_clean
     
@@ -83,15 +109,16 @@ class DataProcessor:
         if df.empty:
             return df
         
-        df_clean = df.copy()
+        df_clean = df.copy(deep=False)
         
         # Convert date column if exists
         if 'date' in df_clean.columns:
-            df_clean['date'] = pd.to_datetime(df_clean['date'], errors='coerce')
+            # ISO 8601 (the BLS/FRED norm) keeps parsing on the fast C path
+            df_clean['date'] = pd.to_datetime(df_clean['date'], format='ISO8601', errors='coerce')
             
-            # Extract year if not present
+            # Extract year if not present (years fit in 16 bits)
             if 'year' not in df_clean.columns:
-                df_clean['year'] = df_clean['date'].dt.year
+                df_clean['year'] = df_clean['date'].dt.year.astype('Int16')
         
         # Convert employment metrics to numeric
         employment_cols = [
@@ -103,9 +130,37 @@ class DataProcessor:
             if col in df_clean.columns:
                 df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
         
+        df_clean = self._compress_dtypes(df_clean)
+        
         # Remove duplicate entries (same year/period)
         if 'year' in df_clean.columns and 'period' in df_clean.columns:
-            df_clean = df_clean.drop_duplicates(subset=['year', 'period'])
+            # Dedupe on one integer key built from the factorized year and
+            # period codes, keeping the first row of each pair (NaN included)
+            year_codes, _ = pd.factorize(df_clean['year'])
+            period_codes, periods = pd.factorize(df_clean['period'])
+            pair_key = (year_codes.astype(np.int64) + 1) * (len(periods) + 1) + (period_codes + 1)
+            _, first_rows = np.unique(pair_key, return_index=True)
+            if len(first_rows) < len(df_clean):
+                df_clean = df_clean.iloc[np.sort(first_rows)]
+        
+        return df_clean
+    
+    def _compress_dtypes(self, df_clean: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shrink cleaned columns to compact dtypes.
+        
+        Low-cardinality label columns become categoricals; numeric columns
+        keep their dtypes so no values are rounded.
+        
+        Args:
+            df_clean: Cleaned DataFrame (its columns are replaced, not mutated)
+            
+        Returns:
+            The same DataFrame with compressed column dtypes
+        """
+        for col in self.CATEGORY_COLUMNS:
+            if col in df_clean.columns and not isinstance(df_clean[col].dtype, pd.CategoricalDtype):
+                df_clean[col] = df_clean[col].astype('category')
         
         return df_clean
     
@@ -125,31 +180,60 @@ class DataProcessor:
             logger.warning("One or both datasets are empty, cannot merge")
             return pd.DataFrame()
         
-        # Prepare enrollment data for merging
-        enrollment_merge = enrollment_df.copy()
-        if 'year' in enrollment_merge.columns:
-            enrollment_agg = enrollment_merge.groupby('year').agg({
-                col: 'sum' for col in enrollment_merge.select_dtypes(include=[np.number]).columns
-                if col != 'year'
-            }).reset_index()
-            enrollment_agg.columns = [f"enrollment_{col}" if col != 'year' else col 
-                                    for col in enrollment_agg.columns]
+        if self.engine == 'polars':
+            return self._merge_with_polars(enrollment_df, employment_df)
+        
+        # Prepare enrollment data for merging; only the year key and numeric
+        # columns are projected into the groupby, nothing else is copied
+        if 'year' in enrollment_df.columns:
+            enrollment_cols = [col for col in enrollment_df.select_dtypes(include=[np.number]).columns
+                               if col != 'year']
+            enrollment_agg = (enrollment_df[['year', *enrollment_cols]]
+                              .groupby('year').sum()
+                              .add_prefix('enrollment_'))
         
         # Prepare employment data for merging (use annual averages)
-        employment_merge = employment_df.copy()
-        if 'year' in employment_merge.columns:
-            employment_agg = employment_merge.groupby('year').agg({
-                col: 'mean' for col in employment_merge.select_dtypes(include=[np.number]).columns
-                if col != 'year'
-            }).reset_index()
-            employment_agg.columns = [f"employment_{col}" if col != 'year' else col 
-                                    for col in employment_agg.columns]
-        
-        # Merge on year
-        merged_df = pd.merge(enrollment_agg, employment_agg, on='year', how='inner')
+        if 'year' in employment_df.columns:
+            employment_cols = [col for col in employment_df.select_dtypes(include=[np.number]).columns
+                               if col != 'year']
+            employment_agg = (employment_df[['year', *employment_cols]]
+                              .groupby('year').mean()
+                              .add_prefix('employment_'))
+        
+        # Join on the sorted, unique year index both groupbys produce
+        merged_df = enrollment_agg.join(employment_agg, how='inner').reset_index()
         
         return merged_df
     
+    @staticmethod
+    def _merge_with_polars(enrollment_df: pd.DataFrame,
+                           employment_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Polars version of the annual aggregation and year join.
+        
+        Args:
+            enrollment_df: Cleaned enrollment data
+            employment_df: Cleaned employment data
+            
+        Returns:
+            Merged DataFrame, laid out like the pandas path
+        """
+        import polars as pl
+        
+        def annual(df: pd.DataFrame, how: str, prefix: str) -> 'pl.LazyFrame':
+            cols = [col for col in df.select_dtypes(include=[np.number]).columns if col != 'year']
+            agg = getattr(pl.col(cols), how)()
+            return (pl.from_pandas(df[['year', *cols]]).lazy()
+                    .group_by('year')
+                    .agg(agg.name.prefix(prefix)))
+        
+        merged = (annual(enrollment_df, 'sum', 'enrollment_')
+                  .join(annual(employment_df, 'mean', 'employment_'), on='year', how='inner')
+                  .sort('year')
+                  .collect())
+        
+        return merged.to_pandas()
+    
     def calculate_derived_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate derived metrics and ratios.
@@ -161,92 +245,155 @@ class DataProcessor:
             DataFrame with additional calculated metrics
         """
         df_with_metrics = df.copy()
+        columns = df.columns
         
-        # Enrollment ratios
-        if 'enrollment_total_enrollment' in df.columns:
-            total_col = 'enrollment_total_enrollment'
-            
-            if 'enrollment_undergraduate' in df.columns:
-                df_with_metrics['undergraduate_ratio'] = (
-                    df_with_metrics['enrollment_undergraduate'] / 
-                    df_with_metrics[total_col]
-                )
-            
-            if 'enrollment_graduate' in df.columns:
-                df_with_metrics['graduate_ratio'] = (
-                    df_with_metrics['enrollment_graduate'] / 
-                    df_with_metrics[total_col]
-                )
+        # Year-over-year growth rates need the rows in year order; merged
+        # data already arrives sorted, so the sort is usually skipped
+        if 'year' in columns and not df_with_metrics['year'].is_monotonic_increasing:
+            df_with_metrics = df_with_metrics.sort_values('year', kind='stable', ignore_index=True)
         
-        # Employment ratios
-        if 'employment_civilian_labor_force' in df.columns and 'employment_employment_level' in df.columns:
-            df_with_metrics['employment_ratio'] = (
-                df_with_metrics['employment_employment_level'] / 
-                df_with_metrics['employment_civilian_labor_force']
-            )
+        # Read every input column into one float64 block and compute all
+        # metrics from its column views
+        inputs = [col for col in self.DERIVED_METRIC_INPUTS if col in columns]
+        block = df_with_metrics[inputs].to_numpy(dtype=np.float64)
+        values = {col: block[:, i] for i, col in enumerate(inputs)}
+        metrics = {}
         
-        # Year-over-year growth rates
-        if 'year' in df.columns:
-            df_with_metrics = df_with_metrics.sort_values('year')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Enrollment ratios
+            if 'enrollment_total_enrollment' in values:
+                total = values['enrollment_total_enrollment']
+                
+                if 'enrollment_undergraduate' in values:
+                    metrics['undergraduate_ratio'] = values['enrollment_undergraduate'] / total
+                
+                if 'enrollment_graduate' in values:
+                    metrics['graduate_ratio'] = values['enrollment_graduate'] / total
             
-            # Enrollment growth
-            if 'enrollment_total_enrollment' in df.columns:
-                df_with_metrics['enrollment_growth_rate'] = (
-                    df_with_metrics['enrollment_total_enrollment'].pct_change()
+            # Employment ratios
+            if 'employment_civilian_labor_force' in values and 'employment_employment_level' in values:
+                metrics['employment_ratio'] = (
+                    values['employment_employment_level'] / 
+                    values['employment_civilian_labor_force']
                 )
             
-            # Employment growth
-            if 'employment_employment_level' in df.columns:
-                df_with_metrics['employment_growth_rate'] = (
-                    df_with_metrics['employment_employment_level'].pct_change()
-                )
+            # Year-over-year growth rates
+            if 'year' in columns:
+                for col, metric in [('enrollment_total_enrollment', 'enrollment_growth_rate'),
+                                    ('employment_employment_level', 'employment_growth_rate')]:
+                    if col in values:
+                        growth = np.full(len(block), np.nan)
+                        growth[1:] = values[col][1:] / values[col][:-1] - 1
+                        metrics[metric] = growth
+        
+        if metrics:
+            df_with_metrics[list(metrics)] = np.column_stack(list(metrics.values()))
         
         return df_with_metrics
     
+    def _cache_path(self, filename: str) -> Path:
+        """Map a cache filename to its Parquet file (.csv names are rewritten)."""
+        filepath = self.cache_dir / filename
+        if filepath.suffix == '.csv':
+            filepath = filepath.with_suffix('.parquet')
+        return filepath
+    
     def save_processed_data(self, df: pd.DataFrame, filename: str) -> None:
         """
         Save processed data to cache.
         
+        Data is stored as Snappy-compressed Parquet so dtypes survive the
+        round-trip; a .csv filename is saved under the matching .parquet name.
+        
         Args:
             df: DataFrame to save
             filename: Output filename
         """
-        filepath = self.cache_dir / filename
-        df.to_csv(filepath, index=False)
+        filepath = self._cache_path(filename)
+        df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
         logger.info(f"Saved processed data to {filepath}")
     
-    def load_processed_data(self, filename: str) -> Optional[pd.DataFrame]:
+    def load_processed_data(self, filename: str,
+                            columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Load processed data from cache.
         
         Args:
-            filename: Filename to load
+            filename: Filename to load (as passed to save_processed_data)
+            columns: Optional subset of columns to read
             
         Returns:
             DataFrame if file exists, None otherwise
         """
-        filepath = self.cache_dir / filename
+        filepath = self._cache_path(filename)
         if filepath.exists():
             logger.info(f"Loading processed data from {filepath}")
-            return pd.read_csv(filepath)
+            return pd.read_parquet(filepath, engine='pyarrow', columns=columns)
+        
+        # Caches written before the switch to Parquet
+        legacy_path = self.cache_dir / filename
+        if legacy_path.suffix == '.csv' and legacy_path.exists():
+            logger.info(f"Loading processed data from {legacy_path}")
+            return pd.read_csv(legacy_path, usecols=columns)
         return None
 
 
+# Memoized process_and_merge results live in the (untracked) cache directory;
+# bump MERGE_CACHE_VERSION whenever cleaning, merging or derived metrics change
+# so results computed by older code are not reused
+MERGE_MEMO_DIR = Path("data/cache") / "merged"
+MERGE_CACHE_VERSION = 1
+MERGE_MEMO_KEEP = 8
+
+
+def _frames_digest(*frames: pd.DataFrame, salt: str = '') -> str:
+    """Content hash of DataFrames (values, column names and dtypes), plus salt."""
+    digest = hashlib.blake2b(salt.encode(), digest_size=16)
+    for df in frames:
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _prune_merge_memos(memo_dir: Path, keep: int = MERGE_MEMO_KEEP) -> None:
+    """Delete all but the keep most recently used memoized merge results."""
+    memos = sorted(memo_dir.glob("merged_*.parquet"), key=lambda path: path.stat().st_mtime,
+                   reverse=True)
+    for path in memos[keep:]:
+        path.unlink(missing_ok=True)
+
+
 def process_and_merge(enrollment_data: pd.DataFrame, employment_data: pd.DataFrame,
                      save_cache: bool = True) -> pd.DataFrame:
     """
     Convenience function to process and merge datasets.
     
+    With save_cache, results are also memoized under MERGE_MEMO_DIR, keyed by
+    the inputs' content and MERGE_CACHE_VERSION; only the MERGE_MEMO_KEEP
+    most recently used results are kept.
+    
     Args:
         enrollment_data: Raw enrollment data
         employment_data: Raw employment data
-        save_cache: Whether to save processed data to cache
+        save_cache: Whether to save processed data to cache and reuse a cached
+                    result when the inputs are unchanged
         
     Returns:
         Processed and merged DataFrame
     """
     processor = DataProcessor()
     
+    # Reuse an earlier result when both inputs and the merge code are unchanged
+    memo_path = None
+    if save_cache:
+        digest = _frames_digest(enrollment_data, employment_data,
+                                salt=f"v{MERGE_CACHE_VERSION}")
+        memo_path = MERGE_MEMO_DIR / f"merged_{digest}.parquet"
+        if memo_path.exists():
+            logger.info(f"Inputs unchanged, loading merged data from {memo_path}")
+            memo_path.touch()
+            return pd.read_parquet(memo_path, engine='pyarrow')
+    
     # Clean individual datasets
     clean_enrollment = processor.clean_enrollment_data(enrollment_data)
     clean_employment = processor.clean_employment_data(employment_data)
@@ -259,6 +406,9 @@ def process_and_merge(enrollment_data: pd.DataFrame, employment_data: pd.DataFra
     
     # Save to cache if requested
     if save_cache and not final_data.empty:
-        processor.save_processed_data(final_data, "merged_labor_education_data.csv")
+        processor.save_processed_data(final_data, "merged_labor_education_data.parquet")
+        MERGE_MEMO_DIR.mkdir(parents=True, exist_ok=True)
+        final_data.to_parquet(memo_path, engine='pyarrow', compression='snappy', index=False)
+        _prune_merge_memos(MERGE_MEMO_DIR)
     
-    return final_data
\ No newline at end of file
+    return final_data
@@ -5,8 +5,10 @@ Handles fetching and processing College Scorecard data for labor market outcomes
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import logging
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,23 @@ logger = logging.getLogger(__name__)
 class ScorecardCollector:
     """Collector for College Scorecard institutional data."""
     
+    # Column groups used by the extractors; pass them to load_from_file to
+    # parse only what a given extractor needs
+    BASE_COLS = ['UNITID', 'INSTNM', 'STABBR']
+    EARNINGS_COLS = BASE_COLS + [
+        'MD_EARN_WNE_P10',  # Median earnings 10 years after entry
+        'MD_EARN_WNE_P6',   # Median earnings 6 years after entry
+        'GT_25K_P10',        # Share earning >$25K after 10 years
+    ]
+    COMPLETION_COLS = BASE_COLS + [
+        'C150_4_POOLED_SUPP',  # Completion rate (150% time, 4-year)
+        'C200_4_POOLED_SUPP',  # Completion rate (200% time, 4-year)
+    ]
+    PCIP_PATTERN = 'PCIP'
+    
+    # Cell values read as missing (Scorecard suppresses small-cell statistics)
+    NULL_VALUES = ['', 'NULL', 'PrivacySuppressed']
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize Scorecard collector.
@@ -25,27 +44,86 @@ class ScorecardCollector:
         self.api_key = api_key
         self.base_url = "https://api.data.gov/ed/collegescorecard/v1/"
         
-    def load_from_file(self, file_path: str) -> pd.DataFrame:
+    def load_from_file(self, file_path: str, columns: Optional[Iterable[str]] = None,
+                       category_cols: Tuple[str, ...] = ('STABBR',)) -> pd.DataFrame:
         """
         Load College Scorecard data from CSV file.
         
+        Suppressed cells ('PrivacySuppressed') are read as missing values.
+        
         Args:
             file_path: Path to College Scorecard CSV file
+            columns: Columns to parse (default: all). Names ending in '*' select
+                     every column with that prefix, e.g. 'PCIP*'; names missing
+                     from the file are skipped, but at least one must match
+            category_cols: Label columns to read as categoricals (string-valued;
+                           numeric codes such as CONTROL stay integers)
             
         Returns:
             DataFrame with College Scorecard data
+            
+        Raises:
+            FileNotFoundError: If file_path does not exist
+            ValueError: If columns is given but none of them are in the file
         """
         file_path = Path(file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"College Scorecard data file not found: {file_path}")
         
+        # Categoricals are parsed straight to dictionary-encoded arrays
+        column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in category_cols}
+        column_types['INSTNM'] = pa.string()
+        
+        usecols = []
+        if columns is not None:
+            # Resolve the projection against the header so only those columns are parsed
+            header = pd.read_csv(file_path, nrows=0).columns
+            usecols = self._resolve_columns(header, columns)
+            # An empty include list makes pyarrow read every column
+            if not usecols:
+                raise ValueError(f"None of the requested columns are in {file_path}")
+        
         logger.info(f"Loading College Scorecard data from {file_path}")
-        df = pd.read_csv(file_path, low_memory=False)
+        # pyarrow tokenizes blocks in parallel and turns suppression sentinels
+        # into nulls during the parse
+        table = pacsv.read_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=32 << 20),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=usecols,
+                column_types=column_types,
+                null_values=self.NULL_VALUES,
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas()
+        
+        # Match read_csv: sorted categories and a string-typed name column
+        for col in category_cols:
+            if col in df.columns:
+                df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+        if 'INSTNM' in df.columns:
+            df['INSTNM'] = df['INSTNM'].astype('string')
         logger.info(f"Loaded {len(df):,} institutions with {len(df.columns)} columns")
         
         return df
     
+    @staticmethod
+    def _resolve_columns(header: pd.Index, columns: Iterable[str]) -> List[str]:
+        """Expand prefix patterns and keep the requested columns present in header."""
+        exact = set()
+        prefixes = []
+        for col in columns:
+            if col.endswith('*'):
+                prefixes.append(col[:-1])
+            else:
+                exact.add(col)
+        
+        return [col for col in header
+                if col in exact
+                or any(col.startswith(prefix) and col != prefix for prefix in prefixes)]
+    
     def fetch_from_api(self, year: int = 2021, fields: Optional[list] = None) -> pd.DataFrame:
         """
         Fetch College Scorecard data from API.
@@ -69,22 +147,16 @@ class ScorecardCollector:
             df: Full College Scorecard DataFrame
             
         Returns:
-            DataFrame with earnings variables
+            DataFrame with earnings variables (a column selection of df; copy it
+            before modifying)
         """
-        earnings_cols = [
-            'UNITID', 'INSTNM', 'STABBR',
-            'MD_EARN_WNE_P10',  # Median earnings 10 years after entry
-            'MD_EARN_WNE_P6',   # Median earnings 6 years after entry
-            'GT_25K_P10',        # Share earning >$25K after 10 years
-        ]
-        
-        available_cols = [col for col in earnings_cols if col in df.columns]
+        available_cols = [col for col in self.EARNINGS_COLS if col in df.columns]
         
         if not available_cols:
             logger.warning("No earnings columns found in data")
             return pd.DataFrame()
         
-        return df[available_cols].copy()
+        return df[available_cols]
     
     def get_completion_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -94,16 +166,11 @@ class ScorecardCollector:
             df: Full College Scorecard DataFrame
             
         Returns:
-            DataFrame with completion variables
+            DataFrame with completion variables (a column selection of df; copy it
+            before modifying)
         """
-        completion_cols = [
-            'UNITID', 'INSTNM', 'STABBR',
-            'C150_4_POOLED_SUPP',  # Completion rate (150% time, 4-year)
-            'C200_4_POOLED_SUPP',  # Completion rate (200% time, 4-year)
-        ]
-        
-        available_cols = [col for col in completion_cols if col in df.columns]
-        return df[available_cols].copy()
+        available_cols = [col for col in self.COMPLETION_COLS if col in df.columns]
+        return df[available_cols]
     
     def get_field_of_study_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -113,16 +180,18 @@ class ScorecardCollector:
             df: Full College Scorecard DataFrame
             
         Returns:
-            DataFrame with field of study percentages
+            DataFrame with field of study percentages (a column selection of df;
+            copy it before modifying)
         """
-        base_cols = ['UNITID', 'INSTNM', 'STABBR']
-        pcip_cols = [col for col in df.columns if col.startswith('PCIP') and col != 'PCIP']
+        base_cols = self.BASE_COLS
+        is_pcip = df.columns.str.startswith(self.PCIP_PATTERN) & (df.columns != self.PCIP_PATTERN)
+        pcip_cols = df.columns[is_pcip].tolist()
         
         if not pcip_cols:
             logger.warning("No PCIP (field of study) columns found")
-            return df[base_cols].copy()
+            return df[base_cols]
         
-        return df[base_cols + pcip_cols].copy()
+        return df[base_cols + pcip_cols]
 
 
 def load_scorecard_data(file_path: str) -> pd.DataFrame:
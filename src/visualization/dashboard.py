@@ -36,13 +36,22 @@ def generate_report(data: pd.DataFrame, output_path: Optional[str] = None) -> st
     Returns:
         Report content as string
     """
+    # Year range: sorted data (the merged output) just reads the end points
+    first_year = last_year = 'N/A'
+    if 'year' in data.columns:
+        year = data['year']
+        if len(year) and year.is_monotonic_increasing:
+            first_year, last_year = year.iat[0], year.iat[-1]
+        else:
+            first_year, last_year = year.min(), year.max()
+    
     report = f"""
 # Labor Dynamics Analysis Report
 
 ## Summary
 - Dataset contains {len(data)} records
-- Analysis period: {data['year'].min() if 'year' in data.columns else 'N/A'} - {data['year'].max() if 'year' in data.columns else 'N/A'}
-- Variables analyzed: {len(data.columns)}
+- Analysis period: {first_year} - {last_year}
+- Variables analyzed: {data.shape[1]}
 
 ## Key Findings
 [Findings will be populated as analysis develops]
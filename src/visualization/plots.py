@@ -2,16 +2,134 @@
 Plotting utilities for Labor Dynamics Analysis
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+import json
+import hashlib
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Optional, List, Tuple, Dict
+from typing import TYPE_CHECKING, Optional, List, Tuple, Dict
+
+# matplotlib (and seaborn) are imported inside the plotting functions so that
+# importing this package does not pay their start-up cost
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+
+# Resolution of saved figures
+_SAVE_DPI = 300
+
+# zlib level for saved PNGs; level 1 encodes several times faster than the
+# default of 6 for slightly larger files
+_PNG_COMPRESS_LEVEL = int(os.environ.get('LDA_PNG_LEVEL', '1'))
+
+# Bump when a plotting change alters rendered output, so figures saved by
+# older code are not treated as current (see _save_figure)
+_PLOT_CODE_VERSION = 1
+
+# Records of the inputs behind each saved figure, kept out of the output
+# directories
+_FINGERPRINT_DIR = Path('data/cache/figures')
+
+
+def _fig_fingerprint(arrays, *labels) -> str:
+    """
+    Content hash of a figure's inputs.
+    
+    Args:
+        arrays: NumPy arrays or DataFrames plotted in the figure
+        labels: Titles, column names and other values that change the render
+        
+    Returns:
+        Hex digest identifying the rendered output
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for values in arrays:
+        if isinstance(values, pd.DataFrame):
+            digest.update(repr(list(values.columns)).encode())
+            values = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        digest.update(np.ascontiguousarray(values).tobytes())
+    digest.update(repr(labels).encode())
+    return digest.hexdigest()
+
+
+def _save_figure(fig: 'Figure', path, fingerprint: Optional[str] = None) -> None:
+    """
+    Save a figure at _SAVE_DPI, using fast PNG compression for .png targets.
+    
+    With a fingerprint, the render is skipped when path still holds the file
+    last saved there from the same inputs, format, DPI, PNG compression and
+    _PLOT_CODE_VERSION. The record is kept under _FINGERPRINT_DIR.
+    
+    Args:
+        fig: Figure to save
+        path: Output file path
+        fingerprint: Content hash of the figure's inputs (see _fig_fingerprint)
+    """
+    path = Path(path)
+    record = None
+    if fingerprint is not None:
+        fingerprint = hashlib.blake2b(repr((fingerprint, path.suffix.lower(), _SAVE_DPI,
+                                            _PNG_COMPRESS_LEVEL, _PLOT_CODE_VERSION)).encode(),
+                                      digest_size=16).hexdigest()
+        path_key = hashlib.blake2b(str(path.resolve()).encode(), digest_size=16).hexdigest()
+        record = _FINGERPRINT_DIR / f"{path_key}.json"
+        if path.exists() and record.exists():
+            try:
+                stat = path.stat()
+                if json.loads(record.read_text()) == [fingerprint, stat.st_size, stat.st_mtime_ns]:
+                    return
+            except (OSError, ValueError):
+                pass
+    
+    # The plotters lay figures out with tight_layout, so the extra render
+    # pass of bbox_inches='tight' is not needed
+    kwargs = {}
+    if path.suffix.lower() == '.png':
+        kwargs['pil_kwargs'] = {'compress_level': _PNG_COMPRESS_LEVEL}
+    fig.savefig(path, dpi=_SAVE_DPI, **kwargs)
+    
+    if record is not None:
+        stat = path.stat()
+        record.parent.mkdir(parents=True, exist_ok=True)
+        record.write_text(json.dumps([fingerprint, stat.st_size, stat.st_mtime_ns]))
+
+
+def _numeric_block(df: pd.DataFrame, cols) -> np.ndarray:
+    """Columns of df as a new, writable float32 array in column-major (Fortran) order."""
+    return np.array(df[cols].to_numpy(dtype=np.float32), order='F')
+
+
+def _linfit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, np.ndarray]:
+    """
+    Least-squares line through (x, y) in closed form, evaluated at x.
+    
+    Equivalent to np.polyfit(x, y, 1) and np.polyval without building a
+    Vandermonde matrix and calling into LAPACK; the fitted values are
+    written into the centred-x buffer, so the fit allocates one array.
+    
+    Args:
+        x: Independent variable values
+        y: Dependent variable values
+        
+    Returns:
+        Tuple of (slope, intercept, fitted y values at x)
+    """
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    slope = np.dot(dx, y - y_mean) / np.dot(dx, dx)
+    
+    # slope * x + intercept == slope * (x - x_mean) + y_mean
+    fitted = dx
+    fitted *= slope
+    fitted += y_mean
+    return slope, y_mean - slope * x_mean, fitted
 
 
 def create_trend_plot(df: pd.DataFrame, x_col: str, y_col: str, 
-                     title: str = None, save_path: str = None) -> plt.Figure:
+                     title: str = None, save_path: str = None) -> 'Figure':
     """
     Create a trend plot with trend line.
     
@@ -25,15 +143,20 @@ def create_trend_plot(df: pd.DataFrame, x_col: str, y_col: str,
     Returns:
         matplotlib Figure object
     """
+    # Pull both columns out once as float64 arrays for plotting and the fit
+    x = df[x_col].to_numpy(dtype=np.float64)
+    y = df[y_col].to_numpy(dtype=np.float64)
+    
+    import matplotlib.pyplot as plt
+    
     fig, ax = plt.subplots(figsize=(12, 6))
     
     # Main trend line
-    ax.plot(df[x_col], df[y_col], marker='o', linewidth=2, markersize=6)
+    ax.plot(x, y, marker='o', linewidth=2, markersize=6)
     
     # Add trend line
-    z = np.polyfit(df[x_col], df[y_col], 1)
-    p = np.poly1d(z)
-    ax.plot(df[x_col], p(df[x_col]), "--", alpha=0.7, color='red', label='Trend')
+    _, _, trend = _linfit(x, y)
+    ax.plot(x, trend, "--", alpha=0.7, color='red', label='Trend')
     
     ax.set_xlabel(x_col.replace('_', ' ').title())
     ax.set_ylabel(y_col.replace('_', ' ').title())
@@ -44,16 +167,37 @@ def create_trend_plot(df: pd.DataFrame, x_col: str, y_col: str,
     plt.tight_layout()
     
     if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        _save_figure(fig, save_path, _fig_fingerprint([x, y], x_col, y_col, title))
+    
+    return fig
+
+
+def _placeholder_figure(message: str, title: str, save_path: Optional[str]) -> 'Figure':
+    """Figure with a centred message in place of a plot that has no data to show."""
+    import matplotlib.pyplot as plt
+    
+    fig, ax = plt.subplots(figsize=(10, 8))
+    ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=14, transform=ax.transAxes)
+    ax.set_axis_off()
+    ax.set_title(title)
+    
+    if save_path:
+        _save_figure(fig, save_path, _fig_fingerprint([], message, title))
     
     return fig
 
 
 def create_correlation_heatmap(df: pd.DataFrame, title: str = None, 
-                             save_path: str = None) -> plt.Figure:
+                             save_path: str = None) -> 'Figure':
     """
     Create a correlation heatmap.
     
+    With fewer than two numeric columns there is nothing to correlate, and a
+    figure stating so is returned instead.
+    
+    The output format follows the save_path suffix; .svg and .pdf are written
+    by matplotlib's vector backends without rasterizing the figure.
+    
     Args:
         df: DataFrame to calculate correlations
         title: Plot title
@@ -62,30 +206,154 @@ def create_correlation_heatmap(df: pd.DataFrame, title: str = None,
     Returns:
         matplotlib Figure object
     """
-    # Calculate correlation matrix
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    corr_matrix = df[numeric_cols].corr()
+    # Pick numeric columns from the dtypes alone; select_dtypes would build a
+    # sub-frame just to read its column labels
+    is_numeric = np.fromiter((dtype.kind in 'iuf' for dtype in df.dtypes),
+                             dtype=bool, count=df.shape[1])
+    numeric_cols = df.columns[is_numeric]
+    if len(numeric_cols) < 2:
+        return _placeholder_figure('Insufficient numeric data', title or 'Correlation Matrix',
+                                   save_path)
+    
+    # Calculate correlation matrix from one column-major float32 block (ample
+    # for 3-decimal annotations): a single np.corrcoef when complete,
+    # pairwise-complete via DataFrame.corr otherwise
+    values = _numeric_block(df, numeric_cols)
+    if np.isnan(values).any():
+        corr = pd.DataFrame(values).corr().to_numpy(copy=True)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.atleast_2d(np.corrcoef(values, rowvar=False))
+    
+    # Blank the upper triangle (diagonal included); seaborn skips NaN cells
+    corr[np.triu_indices_from(corr)] = np.nan
+    corr_matrix = pd.DataFrame(corr, index=numeric_cols, columns=numeric_cols)
     
     # Create heatmap
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     fig, ax = plt.subplots(figsize=(10, 8))
     
-    # Mask upper triangle
-    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+    # Format every annotation in one vectorized pass rather than per cell
+    labels = np.char.mod('%.3f', corr)
     
-    sns.heatmap(corr_matrix, mask=mask, annot=True, cmap='coolwarm', center=0,
-                square=True, fmt='.3f', cbar_kws={"shrink": .8}, ax=ax)
+    sns.heatmap(corr_matrix, annot=labels, cmap='coolwarm', center=0,
+                square=True, fmt='', cbar_kws={"shrink": .8}, ax=ax)
     
     ax.set_title(title or 'Correlation Matrix')
     plt.tight_layout()
     
     if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        _save_figure(fig, save_path, _fig_fingerprint([corr], list(numeric_cols), title))
     
     return fig
 
 
+def _scaled_columns(df: pd.DataFrame, scales: Dict[str, float]) -> Dict[str, np.ndarray]:
+    """
+    Extract the columns of df named in scales, each multiplied by its factor.
+    
+    Args:
+        df: Source DataFrame
+        scales: Scale factor per column; columns missing from df are skipped
+        
+    Returns:
+        Dictionary of column name to scaled float32 array
+    """
+    cols = [col for col in scales if col in df.columns]
+    values = _numeric_block(df, cols)
+    values *= np.array([scales[col] for col in cols], dtype=np.float32)
+    return dict(zip(cols, values.T))
+
+
+def _m4_indices(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Select the points of a series that M4 downsampling keeps.
+    
+    x is split into n_buckets equal-width buckets; in each, the first, last,
+    minimum and maximum points are kept, so the rasterized line is unchanged
+    at that width. Series whose x is not non-decreasing are returned whole.
+    
+    Args:
+        x: x values of the series
+        y: y values aligned with x
+        n_buckets: Number of buckets, typically the plot width in pixels
+        
+    Returns:
+        Sorted indices of the points to draw
+    """
+    if len(x) == 0 or np.any(x[1:] < x[:-1]):
+        return np.arange(len(x))
+    
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+    
+    # Within each bucket, order by y: its first and last entries are the
+    # bucket's minimum and maximum
+    by_value = np.lexsort((y, bucket))
+    keep = np.concatenate([starts, ends, by_value[starts], by_value[ends]])
+    return np.unique(keep)
+
+
+def _year_values(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """The year column of df as float32 (missing years as NaN), or None if absent."""
+    if 'year' not in df.columns:
+        return None
+    return df['year'].to_numpy(dtype=np.float32, na_value=np.nan)
+
+
+def _draw_lines(ax: 'Axes', x, ys: List, colors: List[str],
+                labels: Optional[List[str]] = None, marker: Optional[str] = None) -> None:
+    """
+    Draw one or more series against a shared x as a single LineCollection.
+    
+    One collection is one draw call, rather than a Line2D per series.
+    
+    Args:
+        ax: Axes to draw on
+        x: Shared x values
+        ys: y values of each series
+        colors: Line color of each series
+        labels: Legend label of each series (adds a legend when given)
+        marker: Marker style drawn at each point, if any
+    """
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+    
+    x = np.asarray(x, dtype=np.float32)
+    segments = np.empty((len(ys), len(x), 2), dtype=np.float32)
+    segments[:, :, 0] = x
+    for i, y in enumerate(ys):
+        segments[i, :, 1] = y
+    
+    # Markers are drawn at every point
+    if marker:
+        points = segments.reshape(-1, 2)
+        ax.scatter(points[:, 0], points[:, 1], s=36, marker=marker,
+                   c=np.repeat(colors, len(x)), zorder=3)
+    
+    # Lines of series longer than the saved axes is wide in pixels are reduced
+    # to their per-pixel extremes, which draws the same polyline from far fewer
+    # vertices
+    n_pixels = int(ax.bbox.width / ax.figure.dpi * _SAVE_DPI)
+    if len(x) > 4 * n_pixels > 0:
+        segments = [series[_m4_indices(series[:, 0], series[:, 1], n_pixels)]
+                    for series in segments]
+    ax.add_collection(LineCollection(segments, linewidths=2, colors=colors))
+    ax.autoscale_view()
+    
+    if labels:
+        # loc='best' does not see collection paths, so place the legend explicitly
+        ax.legend(handles=[Line2D([], [], color=color, linewidth=2, label=label)
+                           for color, label in zip(colors, labels)],
+                  loc='center right')
+
+
 def plot_trends(enrollment_data: pd.DataFrame, employment_data: pd.DataFrame,
-               save_path: str = None) -> plt.Figure:
+               save_path: str = None) -> 'Figure':
     """
     Create comprehensive trend plots for enrollment and employment data.
     
@@ -97,42 +365,52 @@ def plot_trends(enrollment_data: pd.DataFrame, employment_data: pd.DataFrame,
     Returns:
         matplotlib Figure object
     """
+    import matplotlib.pyplot as plt
+    
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     fig.suptitle('Labor Dynamics: Comprehensive Trend Analysis', fontsize=16, fontweight='bold')
     
+    # Extract and rescale each frame's plotted columns in one pass
+    # (enrollment in millions, employment level in thousands)
+    enrollment = _scaled_columns(enrollment_data, {'total_enrollment': 1e-6,
+                                                   'undergraduate': 1e-6,
+                                                   'graduate': 1e-6})
+    employment = _scaled_columns(employment_data, {'employment_level': 1e-3,
+                                                   'unemployment_rate': 1.0})
+    enrollment_years = _year_values(enrollment_data)
+    employment_years = _year_values(employment_data)
+    
     # Plot 1: Total Enrollment
     if 'total_enrollment' in enrollment_data.columns and 'year' in enrollment_data.columns:
-        axes[0,0].plot(enrollment_data['year'], enrollment_data['total_enrollment']/1_000_000,
-                      marker='o', linewidth=2, color='blue')
+        _draw_lines(axes[0,0], enrollment_years,
+                    [enrollment['total_enrollment']], ['blue'], marker='o')
         axes[0,0].set_title('Total College Enrollment')
         axes[0,0].set_ylabel('Enrollment (Millions)')
         axes[0,0].grid(True, alpha=0.3)
     
     # Plot 2: Employment Level
     if 'employment_level' in employment_data.columns and 'year' in employment_data.columns:
-        axes[0,1].plot(employment_data['year'], employment_data['employment_level']/1_000,
-                      marker='s', linewidth=2, color='green')
+        _draw_lines(axes[0,1], employment_years,
+                    [employment['employment_level']], ['green'], marker='s')
         axes[0,1].set_title('Employment Level')
         axes[0,1].set_ylabel('Employment (Thousands)')
         axes[0,1].grid(True, alpha=0.3)
     
     # Plot 3: Unemployment Rate
     if 'unemployment_rate' in employment_data.columns:
-        axes[1,0].plot(employment_data['year'], employment_data['unemployment_rate'],
-                      marker='^', linewidth=2, color='red')
+        _draw_lines(axes[1,0], employment_years,
+                    [employment['unemployment_rate']], ['red'], marker='^')
         axes[1,0].set_title('Unemployment Rate')
         axes[1,0].set_ylabel('Rate (%)')
         axes[1,0].grid(True, alpha=0.3)
     
     # Plot 4: Enrollment Breakdown
     if all(col in enrollment_data.columns for col in ['undergraduate', 'graduate']):
-        axes[1,1].plot(enrollment_data['year'], enrollment_data['undergraduate']/1_000_000,
-                      label='Undergraduate', linewidth=2)
-        axes[1,1].plot(enrollment_data['year'], enrollment_data['graduate']/1_000_000,
-                      label='Graduate', linewidth=2)
+        _draw_lines(axes[1,1], enrollment_years,
+                    [enrollment['undergraduate'], enrollment['graduate']],
+                    ['C0', 'C1'], labels=['Undergraduate', 'Graduate'])
         axes[1,1].set_title('Enrollment by Level')
         axes[1,1].set_ylabel('Enrollment (Millions)')
-        axes[1,1].legend()
         axes[1,1].grid(True, alpha=0.3)
     
     # Set x-labels for bottom plots
@@ -144,6 +422,52 @@ def plot_trends(enrollment_data: pd.DataFrame, employment_data: pd.DataFrame,
     if save_path:
         save_dir = Path(save_path)
         save_dir.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_dir / 'comprehensive_trends.png', dpi=300, bbox_inches='tight')
+        fingerprint = _fig_fingerprint([enrollment_data, employment_data])
+        _save_figure(fig, save_dir / 'comprehensive_trends.png', fingerprint)
+    
+    return fig
+
+
+def render_all(enrollment_data: pd.DataFrame, employment_data: pd.DataFrame,
+               merged_data: pd.DataFrame, out_dir: str, heatmap_format: str = 'png',
+               heatmap_title: Optional[str] = None) -> List[Path]:
+    """
+    Create and save the standard report figures in one batch.
+    
+    Each figure is saved and closed as soon as it is built, so pyplot does
+    not accumulate them.
+    
+    Args:
+        enrollment_data: Enrollment DataFrame
+        employment_data: Employment DataFrame
+        merged_data: Merged analysis DataFrame
+        out_dir: Directory to save the figures in
+        heatmap_format: File format of the correlation heatmap ('png', 'svg', 'pdf', ...)
+        heatmap_title: Title of the correlation heatmap
+        
+    Returns:
+        Paths of the saved figures
+    """
+    import matplotlib.pyplot as plt
+    
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    
+    fig = plot_trends(enrollment_data, employment_data, save_path=out_dir)
+    plt.close(fig)
+    paths.append(out_dir / 'comprehensive_trends.png')
+    
+    if {'year', 'total_enrollment'} <= set(enrollment_data.columns):
+        path = out_dir / 'enrollment_trend.png'
+        fig = create_trend_plot(enrollment_data, 'year', 'total_enrollment',
+                                save_path=path)
+        plt.close(fig)
+        paths.append(path)
+    
+    path = out_dir / f'correlation_heatmap.{heatmap_format}'
+    fig = create_correlation_heatmap(merged_data, title=heatmap_title, save_path=path)
+    plt.close(fig)
+    paths.append(path)
     
-    return fig
\ No newline at end of file
+    return paths